@@ -2,7 +2,6 @@ import os
 
 from flask import Flask, current_app
 from flask_sqlalchemy import SQLAlchemy
-from flask_bcrypt import Bcrypt
 
 from server.config import DevelopmentConfig, ProductionConfig
 from server.deploy import create_client
@@ -22,7 +21,6 @@ def create_server(config=DevelopmentConfig):
     with app.app_context():
         logger = create_logger(__name__, config)
         current_app.logger = logger
-        current_app.bcrypt = Bcrypt(app)
 
     if not kube_client:
         current_app.logger.fatal("Error creating kubernetes client")
@@ -3,10 +3,16 @@ import logging
 
 from server.config import DevelopmentConfig, ProductionConfig
 
+# Shared by every logger so each log file is only opened once per process
+_file_handlers = {}
+
 def create_logger(name, config=DevelopmentConfig) -> logging.Logger:
     """Returns instantiated logger using environment settings"""
 
     logger = logging.getLogger(name)
+    if logger.handlers:
+        return logger
+
     log_level = config.LOG_LEVEL
     logger.setLevel(log_level)
 
@@ -15,8 +21,11 @@ def create_logger(name, config=DevelopmentConfig) -> logging.Logger:
     console_handler.setFormatter(formatter)
     logger.addHandler(console_handler)
 
-    file_handler = logging.FileHandler(config.LOGS_DIR)
-    file_handler.setFormatter(formatter)
+    file_handler = _file_handlers.get(config.LOGS_DIR)
+    if not file_handler:
+        file_handler = logging.FileHandler(config.LOGS_DIR)
+        file_handler.setFormatter(formatter)
+        _file_handlers[config.LOGS_DIR] = file_handler
     logger.addHandler(file_handler)
 
-    return logger
\ No newline at end of file
+    return logger
@@ -4,16 +4,26 @@ from flask import Flask, current_app
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_cors import CORS
-from flask_bcrypt import Bcrypt
 from flask_socketio import SocketIO
+from sqlalchemy import event
 
 from app.config import DevelopmentConfig, ProductionConfig
 from app.logger import create_logger
+from app.passwords import calibrate_argon2
 
 # Create a single SQLAlchemy instance
 db = SQLAlchemy()
 login_manager = LoginManager()
 
+def _set_sqlite_pragmas(dbapi_conn, _):
+    # WAL lets readers carry on while a write is in progress, NORMAL only fsyncs at checkpoints
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
 def create_app(config=DevelopmentConfig):
     app = Flask(__name__)
 
@@ -24,12 +34,15 @@ def create_app(config=DevelopmentConfig):
     with app.app_context():
         logger = create_logger(__name__)
         current_app.logger = logger
-        current_app.bcrypt = Bcrypt(app)
+        calibrate_argon2()
         current_app.socketio = SocketIO(app, cors_allowed_origins="*")
 
     # Create all tables if not already created
     db.init_app(app)
     with app.app_context():
+        if db.engine.dialect.name == "sqlite":
+            event.listen(db.engine, "connect", _set_sqlite_pragmas)
+
         from app.models import Users, Games, GameServers, GameServerConfigs, MinecraftConfigs
         db.create_all()
 
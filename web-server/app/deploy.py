@@ -1,23 +1,49 @@
 import os
 import shutil
+import zipfile
 import requests
 
 from uuid import uuid4
 from dotenv import load_dotenv
 import docker
+import orjson
+from zipstream import ZipStream
 
 from properties import set_property
 from logger import create_logger
 from properties import Properties
 
+load_dotenv()
+
+INSTANCES_DIR = os.getenv("INSTANCES_DIR")
+RCON_PASSWORD = os.getenv("RCON_PASSWORD")
+
+RUNNING = {"status": "running", "show": "Running", "color": "bg-green-500"}
+EXITED = {"status": "exited", "show": "Stopped", "color": "bg-red-500"}
+RESTARTING = {"status": "restarting", "show": "Restarting", "color": "bg-orange-500"}
+
+# Docker event action -> resulting container state
+STATE_BY_ACTION = {"start": RUNNING, "stop": EXITED, "die": EXITED, "restart": RESTARTING}
+
+_client = None
+
+def get_client() -> docker.DockerClient:
+    """Returns the process wide docker client, so every Deploy reuses the same pooled connections"""
+
+    global _client
+    if _client is None:
+        # The events stream holds a connection open, leave room in the pool for everything else
+        _client = docker.from_env(timeout=30, max_pool_size=16)
+
+    return _client
+
 class Deploy:
     def __init__(self, image, Containers, db, network_name:str="mc-network", timeout:int=5):
-        load_dotenv()
         self.db = db
         self.Containers = Containers
         self.image = image
         self.timeout = timeout
-        self.client = docker.from_env()
+        self.client = get_client()
         self.network_name = network_name
 
         self.network = self.init_network(network_name)
@@ -69,7 +95,7 @@ class Deploy:
 
         try:
             properties.set_property(uuid, "server-port", port)
-            properties.set_property(uuid, "rcon.password", os.getenv("RCON_PASSWORD"))
+            properties.set_property(uuid, "rcon.password", RCON_PASSWORD)
             properties.set_property(uuid, "rcon.port", rcon_port)
             properties.set_property(uuid, "enable-rcon", "true")
         except RuntimeError as e:
@@ -79,13 +105,30 @@ class Deploy:
             self.logger.critical(error)
             raise RuntimeError(error) from e
 
-    def monitor_events(self):
-        for event in self.client.events(decode=True):
-            if event.get('Type') == 'container':
-                container_id = event.get('id')
-                action = event.get('Action')
-                if action in ['start', 'stop', 'die', 'restart']:
-                    print(f"Container {container_id} changed state: {action}")
+    def monitor_events(self, on_change=None):
+        """Streams container lifecycle events, passing the container id and its new state to on_change"""
+
+        chunks = self.client.events(decode=False, filters={"type": "container", "event": list(STATE_BY_ACTION)})
+        for event in self._decode_events(chunks):
+            state = STATE_BY_ACTION.get(event.get('Action'))
+            if not state:
+                continue
+
+            container_id = event.get('id')
+            if on_change:
+                on_change(container_id, state)
+            else:
+                self.logger.debug("Container %s changed state: %s", container_id, state['status'])
+
+    def _decode_events(self, chunks):
+        # Events are newline delimited JSON, but a chunk is not guaranteed to hold exactly one
+        buffer = b""
+        for chunk in chunks:
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield orjson.loads(line)
 
     def create_container(self, user_id: int, subdomain: str):
         uuid = str(uuid4())
@@ -149,7 +192,7 @@ class Deploy:
  
     def _create_instance_dir(self, uuid: str):
         try:
-            path = os.path.join(os.getenv("INSTANCES_DIR"), uuid)
+            path = os.path.join(INSTANCES_DIR, uuid)
             shutil.copytree("./minecraft", path)
             return path
         except OSError as e:
@@ -158,16 +201,33 @@ class Deploy:
 
     def _delete_instance_dir(self, uuid: str):
         try:
-            path = os.path.join(os.getenv("INSTANCES_DIR"), uuid)
+            path = os.path.join(INSTANCES_DIR, uuid)
             shutil.rmtree(path)
             return path
         except OSError as e:
             self.logger.error(f"Failed to delete instance directory: {e}", exc_info=True)
             return None
 
+    def world_archive(self, uuid: str) -> ZipStream:
+        """Returns a zip of the instance's world that is built as it is streamed, nothing is written to disk"""
+
+        world_dir = os.path.join(INSTANCES_DIR, uuid, "world")
+        # Not sized, zipstream-ng can't precompute a length for deflated entries
+        archive = ZipStream()
+
+        for root, _, files in os.walk(world_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                arcname = os.path.join("world", os.path.relpath(path, world_dir))
+                # Region files are already compressed, deflating them again only burns CPU
+                compress_type = zipfile.ZIP_STORED if name.endswith(".mca") else zipfile.ZIP_DEFLATED
+                archive.add_path(path, arcname, compress_type=compress_type)
+
+        return archive
+
     def _get_port(self):
         ports = self.db.session.query(self.Containers.port, self.Containers.rcon_port).order_by(self.db.desc(self.Containers.port)).first()
-        self.logger.debug(ports)
+        self.logger.debug("Highest ports in use: %r", ports)
 
         if ports:
             port = ports.port 
@@ -176,7 +236,7 @@ class Deploy:
             port = 1025
             rcon_port = port + 1
         
-        self.logger.debug(f"Using port: {port}, Rcon port: {rcon_port}")
+        self.logger.debug("Using port: %s, Rcon port: %s", port, rcon_port)
 
         return port+2, rcon_port+2
 
@@ -236,7 +296,7 @@ class Deploy:
         create_response = requests.delete(url, headers=headers)
         if create_response.status_code == 200:
             srv_id = create_response.json()['result']['id']
-            self.logger.debug(f'Deleted successfully: {srv_id}')
+            self.logger.debug('Deleted successfully: %s', srv_id)
             return True
         else:
             self.logger.critical(f'Failed to delete record: {create_response.json()}')
@@ -276,7 +336,7 @@ class Deploy:
     
     def get_status(self, cid):
         return self.get_container(cid).status
-    
+
     def is_running(self, cid) -> bool:
         if self.get_status(cid) == "running":
             return True
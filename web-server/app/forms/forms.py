@@ -1,5 +1,6 @@
 from flask_wtf import FlaskForm
 from wtforms import StringField, PasswordField, SubmitField, BooleanField, SelectField, IntegerField
+from wtforms.fields.core import UnboundField
 from wtforms.validators import DataRequired, Length, Email, EqualTo
 from wtforms_sqlalchemy.fields import QuerySelectField
 
@@ -58,3 +59,7 @@ class ServerPropertiesForm(FlaskForm):
     white_list = SelectField("white_list", choices=[("false", "false"), ("true", "true")], render_kw=server_props_render)
 
     submit = SubmitField('Save and Restart', render_kw={"class": "bg-sky-500 hover:bg-sky-700 text-white py-2 px-5 rounded-full font-bold text-md transition duration-300"})
+
+# server.properties key -> form field name, derived from the declared fields so the two can't drift
+ServerPropertiesForm.KEY_MAP = {name.replace("_", "-"): name for name, field in vars(ServerPropertiesForm).items()
+                                if isinstance(field, UnboundField) and name != "submit"}
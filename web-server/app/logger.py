@@ -2,22 +2,41 @@ import os
 import logging
 from dotenv import load_dotenv
 
+load_dotenv()
+
+LOG_LEVEL = os.getenv("LOG_LEVEL")
+LOG_FILE_PATH = os.path.join(os.getenv("LOGS_DIR", "./logs"), f"{LOG_LEVEL}.log")
+
+# Shared by every logger so the log file is only opened once per process
+_handlers = []
+
+def _get_handlers() -> list:
+    if not _handlers:
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        _handlers.append(console_handler)
+
+        file_handler = logging.FileHandler(LOG_FILE_PATH)
+        file_handler.setFormatter(formatter)
+        _handlers.append(file_handler)
+
+    return _handlers
+
 def create_logger(name) -> logging.Logger:
     """Returns instantiated logger using environment settings"""
 
-    load_dotenv()
-
     logger = logging.getLogger(name)
-    log_level = os.environ.get("LOG_LEVEL")
-    logger.setLevel(log_level)
+    if logger.handlers:
+        return logger
+
+    logger.setLevel(LOG_LEVEL)
 
-    console_handler = logging.StreamHandler()
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    for handler in _get_handlers():
+        logger.addHandler(handler)
 
-    file_handler = logging.FileHandler(os.path.join(os.environ.get("LOGS_DIR"), f"{log_level}.log"))
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    # Ancestors such as "app" carry the same handlers, propagating would write every line twice
+    logger.propagate = False
 
     return logger
@@ -20,7 +20,7 @@ class Users(db.Model, UserMixin):
     id = db.Column(db.Integer, primary_key=True)
     created = db.Column(db.TIMESTAMP, nullable=False, server_default=db.func.now())
     username = db.Column(db.String, unique=False, nullable=False)
-    email = db.Column(db.String, unique=True, nullable=False)
+    email = db.Column(db.String, unique=True, index=True, nullable=False)
     password = db.Column(db.String, nullable=False)
     game_server_limit = db.Column(db.Integer, nullable=True, default=1)
     
@@ -29,7 +29,7 @@ class Users(db.Model, UserMixin):
 class GameServers(db.Model):
     id = db.Column(db.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     created = db.Column(db.TIMESTAMP, nullable=False, server_default=db.func.now())
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     game_server_config = db.relationship('GameServerConfigs', backref='game_servers', lazy='dynamic')
 
 class GameServerConfigs(db.Model):
@@ -52,7 +52,7 @@ class MinecraftConfigs(GameServerConfigs):
     __tablename__ = 'minecraft_configs'
     id = db.Column(db.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     created = db.Column(db.TIMESTAMP, nullable=False, server_default=db.func.now())
-    subdomain = db.Column(db.String, unique=True, nullable=False)
+    subdomain = db.Column(db.String, unique=True, index=True, nullable=False)
     num_players = db.Column(db.Integer(), unique=False, nullable=True, default=10)
     version = db.Column(db.String(), unique=False, nullable=False)
 
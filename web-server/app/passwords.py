@@ -0,0 +1,103 @@
+import os
+import time
+import statistics
+
+import bcrypt
+from dotenv import load_dotenv
+from argon2 import PasswordHasher, Type, extract_parameters
+from argon2.exceptions import VerificationError, InvalidHashError
+
+from app.logger import create_logger
+
+load_dotenv()
+
+# Argon2id with OWASP's recommended 46 MiB memory cost
+MEMORY_COST = 46*1024
+PARALLELISM = os.cpu_count() or 1
+TARGET_HASH_MS = 250
+
+# Set to skip calibration, so every worker and restart hashes with the same parameters
+ARGON2_TIME_COST = os.getenv("ARGON2_TIME_COST")
+
+logger = create_logger(__name__)
+
+# Built on first use by calibrate_argon2
+_hasher = None
+
+# Compared against when no user matches so failed logins cost the same either way
+_dummy_hash = None
+
+def calibrate_argon2(target_ms: int=TARGET_HASH_MS, runs: int=5) -> PasswordHasher:
+    """Picks the highest time_cost whose median hash time stays under target_ms on this machine,
+    unless ARGON2_TIME_COST is configured"""
+
+    global _hasher, _dummy_hash
+
+    if ARGON2_TIME_COST:
+        chosen = PasswordHasher(time_cost=int(ARGON2_TIME_COST), memory_cost=MEMORY_COST, parallelism=PARALLELISM)
+    else:
+        chosen = PasswordHasher(time_cost=1, memory_cost=MEMORY_COST, parallelism=PARALLELISM)
+        for time_cost in range(1, 11):
+            candidate = PasswordHasher(time_cost=time_cost, memory_cost=MEMORY_COST, parallelism=PARALLELISM)
+
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter_ns()
+                candidate.hash("benchmark")
+                timings.append(time.perf_counter_ns() - start)
+
+            if statistics.median(timings) / 1_000_000 > target_ms:
+                break
+            chosen = candidate
+
+    _hasher = chosen
+    _dummy_hash = _hasher.hash("dummy")
+
+    logger.info("Using argon2id time_cost: %s, memory_cost: %s, parallelism: %s", _hasher.time_cost, _hasher.memory_cost, _hasher.parallelism)
+
+    return _hasher
+
+def _get_hasher() -> PasswordHasher:
+    if _hasher is None:
+        calibrate_argon2()
+
+    return _hasher
+
+def hash_password(password: str) -> str:
+    return _get_hasher().hash(password)
+
+def check_password(stored: str, password: str) -> bool:
+    """Verifies password against an argon2 hash, or a legacy bcrypt hash"""
+
+    if _is_bcrypt(stored):
+        return bcrypt.checkpw(password.encode('utf-8'), stored.encode('utf-8'))
+
+    try:
+        return _get_hasher().verify(stored, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+def check_dummy_password(password: str) -> bool:
+    """Pays the cost of a real verification for logins with no matching user"""
+
+    _get_hasher()
+    check_password(_dummy_hash, password)
+    return False
+
+def needs_rehash(stored: str) -> bool:
+    """True only when the stored hash is weaker than the current parameters, not merely different,
+    since calibration can land on a different time_cost per worker or boot"""
+
+    if _is_bcrypt(stored):
+        return True
+
+    try:
+        params = extract_parameters(stored)
+    except InvalidHashError:
+        return False
+
+    hasher = _get_hasher()
+    return params.type != Type.ID or params.time_cost < hasher.time_cost or params.memory_cost < hasher.memory_cost
+
+def _is_bcrypt(stored: str) -> bool:
+    return stored.startswith(("$2a$", "$2b$", "$2y$"))
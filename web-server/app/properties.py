@@ -1,27 +1,36 @@
 from dotenv import load_dotenv
 import configparser
 import os
+from functools import lru_cache
 
 from logger import create_logger
 
+load_dotenv()
+
+INSTANCES_DIR = os.getenv("INSTANCES_DIR")
+
+@lru_cache(maxsize=256)
+def _read_server_properties(path: str, mtime: int):
+    config = configparser.ConfigParser(allow_no_value=True)
+    with open(path, 'r') as f:
+        file_content = '[dummy_section]\n' + f.read()
+    config.read_string(file_content)
+    
+    return {key: value for key, value in config['dummy_section'].items()}
+
 class Properties():
     def __init__(self):
-        load_dotenv()
         self.logger = create_logger(__name__)
 
     def read_server_properties(self, uuid: str):
-        path = os.path.join(os.getenv("INSTANCES_DIR"), f"{uuid}/server.properties")
-        config = configparser.ConfigParser(allow_no_value=True)
-        with open(path, 'r') as f:
-            file_content = '[dummy_section]\n' + f.read()
-        config.read_string(file_content)
-        
-        server_properties = {key: value for key, value in config['dummy_section'].items()}
-        
-        return server_properties
+        path = self._properties_path(uuid)
+        mtime = os.stat(path).st_mtime_ns
+
+        # Copy so callers editing the dict don't poison the cache
+        return dict(_read_server_properties(path, mtime))
 
     def write_server_properties(self, uuid: str, properties: dict):
-        path = os.path.join(os.getenv("INSTANCES_DIR"), f"{uuid}/server.properties")
+        path = self._properties_path(uuid)
         try:
             with open(path, "w") as f:
                 for key, value in properties.items():
@@ -29,6 +38,12 @@ class Properties():
             return True
         except:
             return False
+        finally:
+            # mtime may not tick between quick successive writes, so don't rely on it alone
+            _read_server_properties.cache_clear()
+
+    def _properties_path(self, uuid: str):
+        return os.path.join(INSTANCES_DIR, f"{uuid}/server.properties")
         
     def set_property(self, uuid: str, key, value):
         server_props = self.read_server_properties(uuid)
@@ -1,23 +1,72 @@
 import os
+import select
+import socket
+import struct
 
 from dotenv import load_dotenv
-from mcrcon import MCRcon
 
 from logger import create_logger
 
+load_dotenv()
+
+RCON_PASSWORD = os.getenv("RCON_PASSWORD")
+
+# Source RCON packet types
+LOGIN = 3
+COMMAND = 2
+
 class DudeRcon:
-    def __init__(self):
-        load_dotenv()
+    def __init__(self, timeout: int=2):
+        self.timeout = timeout
         self.logger = create_logger(__name__)
 
-    def command(self, queue, command: str, port: int, ip: str):
-        rcon_pass = os.getenv("RCON_PASSWORD")
+    def command(self, command: str, port: int, ip: str) -> str:
+        """Sends a single command over RCON and returns the server's response"""
+
+        # Socket timeouts instead of mcrcon's SIGALRM, which only works on the main thread
+        with socket.create_connection((ip, port), timeout=self.timeout) as sock:
+            self._send(sock, LOGIN, RCON_PASSWORD)
+            request_id, _ = self._receive(sock)
+            if request_id == -1:
+                error = f"RCON login failed for {ip}:{port}"
+                self.logger.error(error)
+                raise RuntimeError(error)
+
+            self._send(sock, COMMAND, command)
+
+            # Responses over 4096 bytes are split across packets, keep reading while more is waiting
+            response = ""
+            while True:
+                _, payload = self._receive(sock)
+                response += payload
+                # Readable with nothing to peek means the server closed the connection
+                if not select.select([sock], [], [], 0)[0] or not sock.recv(1, socket.MSG_PEEK):
+                    break
+
+            return response
+
+    def _send(self, sock: socket.socket, packet_type: int, payload: str):
+        body = struct.pack("<ii", 0, packet_type) + payload.encode("utf-8") + b"\x00\x00"
+        sock.sendall(struct.pack("<i", len(body)) + body)
+
+    def _receive(self, sock: socket.socket):
+        length = struct.unpack("<i", self._read(sock, 4))[0]
+        request_id, _ = struct.unpack("<ii", self._read(sock, 8))
+        payload = self._read(sock, length - 8)
 
-        with MCRcon(ip, rcon_pass, port=port) as mcr:
-            res = mcr.command(command)
-            queue.put(res)
+        if payload[-2:] != b"\x00\x00":
+            error = "Incorrect padding on RCON packet"
+            self.logger.error(error)
+            raise RuntimeError(error)
 
-            return True
+        return request_id, payload[:-2].decode("utf-8")
 
-        return False
+    def _read(self, sock: socket.socket, size: int) -> bytes:
+        data = b""
+        while len(data) < size:
+            chunk = sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("RCON connection closed mid packet")
+            data += chunk
 
+        return data
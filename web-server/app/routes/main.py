@@ -1,23 +1,29 @@
 import os
-from multiprocessing import Process, Queue
 from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 
-from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, send_file, copy_current_request_context, current_app
+from flask import Blueprint, Response, render_template, redirect, url_for, flash, request, jsonify, send_file, copy_current_request_context, current_app
 from flask_login import LoginManager, login_user, current_user, logout_user, login_required
+from dotenv import load_dotenv
+from sqlalchemy import func
 
 from app import db, login_manager
 from app.models import Users, Games, GameServers, GameServerConfigs, MinecraftConfigs
 from app.logger import create_logger
+from app.passwords import hash_password, check_password, check_dummy_password, needs_rehash
 from app.forms import RegistrationForm, LoginForm, CommandForm, DeleteForm, \
                     ServerCreateForm, ServerPropertiesForm, CommandSelectForm
 
 main = Blueprint('main', __name__, template_folder='../../templates')
 logger = create_logger(__name__)
 
+load_dotenv()
+
+DOMAIN = os.getenv("DOMAIN")
+
 @login_manager.user_loader
 def load_user(user_id):
-    return Users.query.get(int(user_id))
+    return db.session.get(Users, int(user_id))
 
 def authorized(f):
     """Decorator for handling if a user is authorized in regards to login and container access"""
@@ -57,7 +63,7 @@ def debug():
 def register():
     form = RegistrationForm()
     if form.validate_on_submit():
-        hashed_password = current_app.bcrypt.generate_password_hash(form.password.data).decode('utf-8')
+        hashed_password = hash_password(form.password.data)
         email = Users.query.filter_by(email=form.email.data).first()
         if email:
             flash('Register Unsuccessful. Email already associated with account', 'danger')
@@ -75,7 +81,16 @@ def login():
     form = LoginForm()
     if form.validate_on_submit():
         user = Users.query.filter_by(email=form.email.data).first()
-        if user and current_app.bcrypt.check_password_hash(user.password, form.password.data):
+        if user:
+            authenticated = check_password(user.password, form.password.data)
+        else:
+            authenticated = check_dummy_password(form.password.data)
+
+        if authenticated:
+            if needs_rehash(user.password):
+                user.password = hash_password(form.password.data)
+                db.session.commit()
+
             login_user(user, remember=form.remember.data)
             next_page = request.args.get('next')
             return redirect(next_page) if next_page else redirect(url_for('main.home'))
@@ -97,13 +112,8 @@ def about():
 @login_required
 def home():
     form = ServerCreateForm()
-    servers = []
-    results = Users.query.filter_by(email=current_user.email).first()
-
-    if results:
-        game_servers = results.game_servers
-        for item in game_servers:
-            servers.append(item)
+    results = current_user._get_current_object()
+    servers = list(results.game_servers) if results else []
 
     if form.validate_on_submit():
         if reached_creation_limit(id=current_user.id):
@@ -114,7 +124,7 @@ def home():
         # print(game_name)
         return redirect(url_for('create.create_minecraft_form'))
     
-    return render_template("home.html", servers=servers, form=form, domain=os.getenv("DOMAIN"))
+    return render_template("home.html", servers=servers, form=form, domain=DOMAIN)
 
 @main.route("/home/<subdomain>")
 @authorized
@@ -133,41 +143,34 @@ def edit(subdomain):
     # props = properties.read_server_properties(results.uuid)
 
     # if request.method == 'GET':
-    #     for key, val in props.items():
-    #         try:
-    #             key = key.replace("-", "_")
-    #             getattr(form, key).data = val
-    #         except:
-    #             pass
+    #     for key, attr in ServerPropertiesForm.KEY_MAP.items():
+    #         if key in props:
+    #             form._fields[attr].data = props[key]
 
     # if form.validate_on_submit():
-    #     for key, val in props.items():
-    #         try:
-    #             props[key] = getattr(form, key.replace("-", "_")).data
-    #         except:
-    #             pass
+    #     for key, attr in ServerPropertiesForm.KEY_MAP.items():
+    #         if key in props:
+    #             props[key] = form._fields[attr].data
 
     #     properties.write_server_properties(results.uuid, props)
     #     executor.submit(async_restart, subdomain)
 
     return render_template("edit.html")
-    #form=form, command_form=command_form, delete_form=delete_form, subdomain=subdomain, command_select_form=command_select_form, domain=os.getenv("DOMAIN"))
+    #form=form, command_form=command_form, delete_form=delete_form, subdomain=subdomain, command_select_form=command_select_form, domain=DOMAIN)
 
 def user_can_access(id: int, subdomain: str) -> bool:
-    results = Users.query.filter_by(id=id).first().game_servers
+    query = db.session.query(GameServers.id) \
+                      .join(MinecraftConfigs, MinecraftConfigs.game_server_id == GameServers.id) \
+                      .filter(GameServers.user_id == id, MinecraftConfigs.subdomain == subdomain)
 
-    if results:
-        for container in results:
-            if subdomain == container.subdomain:
-                return True
-        
-    return False
+    return db.session.query(query.exists()).scalar()
 
 def reached_creation_limit(id: int):
-    results = Users.query.filter_by(id=id).first()
+    limit = db.session.query(Users.game_server_limit).filter_by(id=id).scalar()
+    count = db.session.query(func.count(GameServers.id)).filter_by(user_id=id).scalar()
 
-    if results:  
-        if len(results.game_servers) >= results.game_server_limit:
+    if limit is not None:
+        if count >= limit:
             return True
     
     return False
@@ -192,13 +195,7 @@ def reached_creation_limit(id: int):
 # def monitor():
 #     @copy_current_request_context
 #     def monitor_events(uid):
-#         for event in deploy.client.events(decode=True):
-#             if event.get('Type') == 'container':
-#                 action = event.get('Action')
-#                 if action in ['start', 'stop', 'die', 'restart']:
-#                     for state in states:
-#                         if state['status'] == action:
-#                             current_app.socketio.emit('container_status', state, room=uid)
+#         deploy.monitor_events(on_change=lambda cid, state: current_app.socketio.emit('container_status', state, room=uid))
     
 #     current_app.socketio.start_background_task(monitor_events, current_user.id)
 #     return jsonify({"status": True})
@@ -231,15 +228,9 @@ def reached_creation_limit(id: int):
 #     container_ip = deploy.get_container_ip(deploy._get_container(subdomain=subdomain))
 #     rcon_port = Containers.query.filter_by(subdomain=subdomain).first().rcon_port
 
-#     queue= Queue()
-
-#     # Run in a new process, thus, it will run on the main thread. Sidestepping ValueError raised by `signals`
-#     p = Process(target=rcon.command, args=(queue, command, rcon_port, container_ip))
-#     p.start()
-#     p.join()
-#     response = queue.get()
+#     response = rcon.command(command, rcon_port, container_ip)
 
-#     logger.info(f"Sent command: {command}, got response: {response}")
+#     logger.info("Sent command: %s, got response: %s", command, response)
 
 #     return response
 
@@ -251,7 +242,7 @@ def reached_creation_limit(id: int):
 #     if form.validate_on_submit():
 #         res = send_rcon_command(subdomain, f"{form.command.data} {form.input.data}")
 
-#         logger.debug(form.command.data)
+#         logger.debug("cmd=%r", form.command.data)
 
 #         return jsonify({"response": res})
     
@@ -267,13 +258,13 @@ def reached_creation_limit(id: int):
 #     delete_form = DeleteForm()
 
 #     if delete_form.validate_on_submit():
-#         logger.info(f"Deleting container attached to subdomain: {subdomain}")
+#         logger.info("Deleting container attached to subdomain: %s", subdomain)
 #         deploy.delete_container(subdomain)
 
 #         return redirect(url_for('home'))
 
 #     return render_template("edit.html", form=form, command_form=command_form, 
-#                            delete_form=delete_form, subdomain=subdomain, domain=os.getenv("DOMAIN"))
+#                            delete_form=delete_form, subdomain=subdomain, domain=DOMAIN)
 
 
 @main.route("/get_status/<subdomain>", methods=['GET', 'POST'])
@@ -294,7 +285,7 @@ def get_status(subdomain):
 # def async_restart(subdomain):
 #     container = get_container(subdomain=subdomain)  # Fetch the container by subdomain
 #     container.restart()  # Restart the container
-#     logger.debug(f"Container {subdomain} restarted.")
+#     logger.debug("Container %s restarted.", subdomain)
 #     return f"Container {subdomain} restarted."
 
 # @app.route("/restart/<subdomain>", methods=['GET', 'POST'])
@@ -334,20 +325,12 @@ def get_status(subdomain):
     
 #     return "Unauthorized", 401
 
-# def get_world_path(subdomain: str):
-#     container = Containers.query.filter_by(subdomain=subdomain).first()
-#     uuid = container.uuid
-#     instances_dir = os.getenv("INSTANCES_DIR")
-#     path = f"{instances_dir}/{uuid}"
-
-#     shutil.make_archive(path+"/world", 'zip', path+"/world")
-
-#     return f"{instances_dir}/{uuid}/world.zip"
-
 # @app.route("/download/<subdomain>", methods=['GET', 'POST'])
 # @authorized
 # def download(subdomain):
-#     path = get_world_path(subdomain)
+#     uuid = Containers.query.filter_by(subdomain=subdomain).first().uuid
+#     archive = deploy.world_archive(uuid)
 
-#     return send_file(path, as_attachment=True)
+#     return Response(archive, mimetype="application/zip",
+#                     headers={"Content-Disposition": "attachment; filename=world.zip"})
 